@@ -1,20 +1,30 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
+import base64
+import hashlib
+import io
+import multiprocessing
 import os
+import queue
+import re
 import shutil
+import sqlite3
 import subprocess
 import sys
 import tempfile
 import tarfile
+import threading
 import zipfile
-import gzip
 from pathlib import Path
-import requests
 import json
-from urllib.parse import urlparse
+from urllib.parse import urlencode, urlparse
 import time
-from datetime import datetime
+from contextlib import closing
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed, wait)
+from datetime import datetime, timezone
 
 ASCII_ART = """
 ██████╗ ███████╗██╗   ██╗███████╗██╗     ██╗ ██████╗ 
@@ -29,35 +39,598 @@ Package Security Scanner - Scan packages for secrets using TruffleHog
 By sud0luke
 """
 
+# Large reads keep per-chunk interpreter overhead low and TCP well fed
+DOWNLOAD_CHUNK_SIZE = 128 * 1024
+
+# Seconds to wait for a connection and between bytes of a response. Without
+# them a stalled registry connection hangs its version forever
+REQUEST_TIMEOUT = (10, 60)
+
+# Tries per archive download. The session's Retry covers errors before a
+# response arrives; this covers connections dropped partway through the body
+DOWNLOAD_ATTEMPTS = 3
+
+# How long a stored TruffleHog result for an archive is reused. Verification
+# status can change as credentials are revoked, so results do expire
+SCAN_RESULT_TTL = 24 * 60 * 60
+
+# Default size limit for cached archives, in MB. Past it, the least
+# recently used archives are deleted after each new one is cached
+ARCHIVE_CACHE_MAX_MB = 5 * 1024
+
+# Maven Central search answers carry no ETag or Last-Modified to revalidate
+# with, so they are reused from the metadata cache for this many seconds
+MAVEN_SEARCH_TTL = 24 * 60 * 60
+
+# How each Maven artifact type appears in a search result's 'ec' list
+MAVEN_FILE_SUFFIXES = {
+    'sources.jar': '-sources.jar',
+    'jar': '.jar',
+    'pom': '.pom',
+}
+
+# Zip archives up to this size are buffered in memory for extraction
+ZIP_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
+# Cached .tar.gz archives over this size are inflated in parallel by the
+# optional rapidgzip module, or else by pigz alongside the untar, when
+# either is installed
+PARALLEL_GUNZIP_MIN_SIZE = 5 * 1024 * 1024
 
-class DiscordLogger:
-    def __init__(self, webhook_url=None):
-        self.webhook_url = webhook_url
-        self.session = requests.Session()
+# Compiled code, media and fonts that secret detectors can't usefully match.
+# Nested archives (.whl, .jar, .zip) are kept: TruffleHog unpacks and scans them
+BINARY_EXTENSIONS = frozenset({
+    '.so', '.dylib', '.dll', '.pyd', '.exe', '.node', '.wasm', '.o', '.a',
+    '.class', '.jnilib',
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp',
+    '.mp3', '.mp4', '.avi', '.mov', '.webm',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot',
+})
+
+# Larger files are generated data or bundled assets rather than source
+MAX_SCANNED_FILE_SIZE = 10 * 1024 * 1024
+
+# Leading bytes of each archive format, mapped like ARCHIVE_SUFFIXES below. A
+# registry may serve a .tgz with Content-Encoding: gzip, which arrives
+# already decompressed, so the bytes are more reliable than the name
+ARCHIVE_MAGIC = {
+    b'\x1f\x8b': 'r|gz',
+    b'BZh': 'r|bz2',
+    b'\xfd7zXZ\x00': 'r|xz',
+    b'PK\x03\x04': 'zip',
+}
+
+# Archive formats by suffix: a stream-mode tarfile.open() mode, naming the
+# compression up front so tarfile doesn't probe, or 'zip'. .crate files are
+# gzipped tarballs
+ARCHIVE_SUFFIXES = {
+    '.tar.gz': 'r|gz',
+    '.tgz': 'r|gz',
+    '.crate': 'r|gz',
+    '.tar.bz2': 'r|bz2',
+    '.tar.xz': 'r|xz',
+    '.tar': 'r|',
+    '.zip': 'zip',
+    '.jar': 'zip',
+}
+
+# Source distribution file names in the PyPI simple index, where files carry
+# no package type: "<name>-<version>" plus one of these
+SDIST_SUFFIXES = ('.tar.gz', '.zip', '.tar.bz2', '.tar.xz', '.tgz', '.tar')
+
+# Runs of these are equivalent in project names (PEP 503 normalization)
+PROJECT_NAME_SEPARATORS_RE = re.compile(r'[-_.]+')
+
+
+# Held while writing any line of output, so lines from concurrent scans
+# don't run into each other
+PRINT_LOCK = threading.Lock()
+
+
+def log(message):
+    """Print a status line whole, even while other threads are printing"""
+    with PRINT_LOCK:
+        print(message, flush=True)
+
+
+def default_cache_dir():
+    """Per-user cache directory, honouring XDG_CACHE_HOME"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'revelio-scan'
+
+
+def default_temp_dir():
+    """Directory for work files: RAM-backed /dev/shm when it has room, otherwise /tmp
+
+    Extracted files are written once, scanned once and deleted, so they never
+    need to reach disk. $REVELIO_TMPFS names another tmpfs mount to use instead.
+    """
+    tmpfs = os.environ.get('REVELIO_TMPFS')
+    if tmpfs and os.path.isdir(tmpfs) and os.access(tmpfs, os.W_OK):
+        return Path(tmpfs)
+    if tmpfs:
+        print(f"[WARN] REVELIO_TMPFS {tmpfs} is not a writable directory, ignoring it")
+
+    shm = Path("/dev/shm")
+    if (shm.is_dir() and os.access(shm, os.W_OK)
+            and shutil.disk_usage(shm).free > 512 * 1024 * 1024):
+        return shm
+    return Path("/tmp")
+
+
+# npm dependency specs that pin one exact version ("1.2.3", "=1.2.3", "v1.2.3-beta.1")
+EXACT_NPM_VERSION_RE = re.compile(r'=?v?(\d+\.\d+\.\d+(?:[-+][0-9A-Za-z.+-]*)?)')
+
+
+class ScannerFatalError(Exception):
+    """A configuration problem that stops the whole run, not just one package"""
+
+
+# Characters that only appear in requirements.txt syntax, never in a bare package name
+REQUIREMENT_SYNTAX_RE = re.compile(r'[#;\\\[<>=!~\s]|^-|://')
+COMMENT_RE = re.compile(r'(^|\s)#.*')
+NAME_END_RE = re.compile(r'[\[<>=!~\s]')
+# pip options that pull in further requirements from elsewhere
+REQUIREMENT_INCLUDE_RE = re.compile(r'-[rce]\b|--(requirement|constraint|editable)\b')
+
+
+def read_package_list(file_path):
+    """Read (name, version) pairs from a package.json, a requirements file or a plain name list
+
+    Versions are only taken from exact pins; anything else is None (latest).
+    """
+    path = Path(file_path)
+    packages = []
+
+    if path.name == 'package.json':
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+        for section in ('dependencies', 'devDependencies', 'optionalDependencies'):
+            for name, spec in (manifest.get(section) or {}).items():
+                match = EXACT_NPM_VERSION_RE.fullmatch(spec.strip())
+                packages.append((name, match.group(1) if match else None))
+    else:
+        for number, raw_line in enumerate(path.read_text(encoding='utf-8').splitlines(), 1):
+            line = raw_line.strip()
+            # Plain package names, the common case, need no further parsing
+            if line and not REQUIREMENT_SYNTAX_RE.search(line):
+                packages.append((line, None))
+                continue
+            # Drop comments, environment markers and line continuations
+            line = COMMENT_RE.sub('', line).split(';', 1)[0].rstrip('\\').strip()
+            if not line:
+                continue
+            if line.startswith('-'):
+                # Other pip options (--hash, --index-url) don't name packages
+                if REQUIREMENT_INCLUDE_RE.match(line):
+                    log(f"[WARN] Skipping {file_path} line {number}, included requirements "
+                        f"and editable installs are not followed: {line}")
+                continue
+            if '://' in line or ' @ ' in line:
+                log(f"[WARN] Skipping {file_path} line {number}, URL and direct "
+                    f"references can't be scanned: {line}")
+                continue
+            # requirements.txt style "name[extra]==1.0"; plain names (including
+            # Maven group:artifact and npm @scope/name) pass through unchanged.
+            # Anything after the pin, such as "--hash=...", is not part of it
+            name, pinned, version = line.partition('==')
+            name = NAME_END_RE.split(name, 1)[0]
+            if not name:
+                log(f"[WARN] Skipping {file_path} line {number}, no package name: {line}")
+                continue
+            version = version.lstrip('=').split(None, 1)[0] if version.strip() else ''
+            if not pinned or not version or '*' in version or ',' in version:
+                version = None
+            packages.append((name, version))
 
-    def send_alert(self, package_info, secrets_found):
-        """Send alert to Discord when verified secrets are found"""
-        if not self.webhook_url or not secrets_found:
-            return
+    # Keep the first occurrence of each package
+    return list(dict.fromkeys(packages))
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file and rename, so readers never see partial files"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def format_finding(line, scan_path):
+    """Render one TruffleHog JSON finding as a single readable line"""
+    try:
+        finding = json.loads(line)
+    except ValueError:
+        return line.rstrip()
 
+    status = 'verified' if finding.get('Verified') else 'unverified'
+    secret = finding.get('Redacted') or finding.get('Raw', '')
+    source = finding.get('SourceMetadata', {}).get('Data', {}).get('Filesystem', {})
+    location = source.get('file', '?')
+    if scan_path is not None and location.startswith(str(scan_path)):
+        location = os.path.relpath(location, scan_path)
+    if source.get('line'):
+        location = f"{location}:{source['line']}"
+
+    return f"{finding.get('DetectorName', 'Unknown')} ({status}) {secret} in {location}"
+
+
+def is_scannable(name, size):
+    """Whether an archive member is worth extracting for TruffleHog"""
+    return size <= MAX_SCANNED_FILE_SIZE and os.path.splitext(name)[1].lower() not in BINARY_EXTENSIONS
+
+
+def safe_tar_member(member, dest_path):
+    """tarfile extraction filter: apply the 'data' filter, skipping members it rejects"""
+    try:
+        return tarfile.data_filter(member, dest_path)
+    except tarfile.FilterError as e:
+        log(f"[WARN] Skipping unsafe archive member {member.name}: {e}")
+        return None
+
+
+class ScanTarFile(tarfile.TarFile):
+    """TarFile that only writes names and contents
+
+    Extracted files are read once by TruffleHog and deleted, so restoring
+    ownership, modes and timestamps is three wasted syscalls per member.
+    """
+
+    def chown(self, tarinfo, targetpath, numeric_owner):
+        pass
+
+    def chmod(self, tarinfo, targetpath):
+        pass
+
+    def utime(self, tarinfo, targetpath):
+        pass
+
+
+def extract_zip(zip_ref, extract_path, skip_binaries=False):
+    """Extract a zip archive, leaving out binaries and oversized files if asked"""
+    members = None
+    if skip_binaries:
+        members = [info for info in zip_ref.infolist()
+                   if info.is_dir() or is_scannable(info.filename, info.file_size)]
+    zip_ref.extractall(extract_path, members)
+
+
+def extract_zip_stream(stream_unzip, source, extract_path, skip_binaries=False):
+    """Extract a zip archive from its local file headers as it is read, without seeking"""
+    chunks = iter(lambda: source.read(1024 * 1024), b'')
+    for raw_name, size, member_chunks in stream_unzip(chunks):
+        name = raw_name.decode('utf-8', 'replace')
+        # Sanitise the name as zipfile does: no absolute paths, no '..'
+        parts = [part for part in name.replace('\\', '/').split('/')
+                 if part not in ('', '.', '..')]
+        if (not parts or name.endswith('/')
+                or (skip_binaries and not is_scannable(name, size or 0))):
+            # Each member has to be read through before the next one
+            for _ in member_chunks:
+                pass
+            continue
+
+        target = extract_path.joinpath(*parts)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Members written with a data descriptor have no size up front, so
+        # the size limit is enforced on the bytes as they arrive
+        written = 0
+        oversized = False
+        with open(target, 'wb') as f:
+            for chunk in member_chunks:
+                if oversized:
+                    continue
+                written += len(chunk)
+                if skip_binaries and written > MAX_SCANNED_FILE_SIZE:
+                    oversized = True
+                    continue
+                f.write(chunk)
+        if oversized:
+            target.unlink()
+
+
+def archive_format(source, filename):
+    """Stream-mode tarfile mode or 'zip' for an archive, from its first bytes or else its name"""
+    head = source.peek(512) if hasattr(source, 'peek') else b''
+    for magic, archive_kind in ARCHIVE_MAGIC.items():
+        if head.startswith(magic):
+            return archive_kind
+    if head[257:262] == b'ustar':
+        return 'r|'
+
+    name = Path(filename.lower())
+    # Version numbers add suffixes of their own, so try the compound
+    # suffix (.tar.gz) first and then the last one (.tgz, .crate)
+    return ARCHIVE_SUFFIXES.get(''.join(name.suffixes[-2:])) or ARCHIVE_SUFFIXES.get(name.suffix)
+
+
+def extract_archive(source, filename, extract_path, work_path, size=0, skip_binaries=False,
+                    archive_kind=None):
+    """Extract a tar, zip or jar archive from a file object, returning False if unsupported
+
+    With skip_binaries, members that is_scannable() rejects are not written.
+    archive_kind, if given, skips format detection.
+    """
+    archive_kind = archive_kind or archive_format(source, filename)
+    if archive_kind and archive_kind != 'zip':
+        # Names of skipped members. A hard link to one of them is skipped
+        # too: tarfile would have to seek back to copy the target's data,
+        # which a stream can't do
+        dropped = set()
+
+        def wanted(member):
+            if member.islnk() and member.linkname in dropped:
+                return False
+            return not (skip_binaries and member.isfile()
+                        and not is_scannable(member.name, member.size))
+
+        def member_filter(member, dest_path):
+            result = safe_tar_member(member, dest_path) if wanted(member) else None
+            if result is None:
+                dropped.add(member.name)
+            return result
+
+        def kept_members(tar):
+            for member in tar:
+                if wanted(member):
+                    yield member
+                else:
+                    dropped.add(member.name)
+
+        # Stream mode never seeks, so download, decompress and untar
+        # happen in a single pass.
+        # A 1 MiB copy buffer writes most members with a single write()
+        # instead of one per 16 KiB
+        with ScanTarFile.open(fileobj=source, mode=archive_kind, copybufsize=1024 * 1024) as tar:
+            if hasattr(tarfile, 'data_filter'):
+                # Drops ownership and special files, and skips members escaping extract_path
+                tar.extractall(extract_path, filter=member_filter)
+            elif skip_binaries:
+                tar.extractall(extract_path, members=kept_members(tar))
+            else:
+                tar.extractall(extract_path)
+    elif archive_kind == 'zip':
+        if source.seekable():
+            with zipfile.ZipFile(source, 'r') as zip_ref:
+                extract_zip(zip_ref, extract_path, skip_binaries)
+            return True
+
+        # With the optional stream-unzip package, members are written as
+        # they download, overlapping network and inflate
         try:
-            # Parse TruffleHog JSON output to count verified secrets
-            verified_count = 0
-            if secrets_found.strip():
-                for line in secrets_found.strip().split('\n'):
-                    try:
-                        result = json.loads(line)
-                        if result.get('Verified', False):
-                            verified_count += 1
-                    except:
-                        continue
+            from stream_unzip import stream_unzip
+        except ImportError:
+            stream_unzip = None
+        if stream_unzip is not None:
+            extract_zip_stream(stream_unzip, source, extract_path, skip_binaries)
+            return True
+
+        # Zip needs a seekable file to read its central directory, so
+        # buffer it, in memory unless it is large
+        with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE, dir=work_path) as spool:
+            if size > ZIP_SPOOL_MAX_SIZE:
+                # Known to be large: go to disk now rather than copying
+                # the in-memory part over when it fills up
+                spool.rollover()
+            # 1 MiB reads keep the copy loop in C with few iterations
+            shutil.copyfileobj(source, spool, 1024 * 1024)
+            with zipfile.ZipFile(spool, 'r') as zip_ref:
+                extract_zip(zip_ref, extract_path, skip_binaries)
+    else:
+        log(f"[WARN] Unsupported archive format: {filename}")
+        return False
+
+    return True
 
-            if verified_count == 0:
+
+def extract_archive_file(archive_path, filename, extract_path, work_path, skip_binaries=False):
+    """Extract an archive on disk; a top-level function so worker processes can run it"""
+    try:
+        with open(archive_path, 'rb') as archive:
+            if (os.fstat(archive.fileno()).st_size > PARALLEL_GUNZIP_MIN_SIZE
+                    and archive_format(archive, filename) == 'r|gz'):
+                try:
+                    import rapidgzip
+                except ImportError:
+                    rapidgzip = None
+                if rapidgzip is not None:
+                    with closing(rapidgzip.RapidgzipFile(
+                            str(archive_path), parallelization=os.cpu_count() or 1)) as gz:
+                        return extract_archive(gz, filename, extract_path, work_path,
+                                               skip_binaries=skip_binaries, archive_kind='r|')
+                pigz = shutil.which('pigz')
+                if pigz:
+                    return extract_gzip_with_pigz(pigz, archive_path, filename, extract_path,
+                                                  work_path, skip_binaries)
+            return extract_archive(archive, filename, extract_path, work_path,
+                                   skip_binaries=skip_binaries)
+    finally:
+        # Worker processes buffer stdout; show any warnings now
+        sys.stdout.flush()
+
+
+def extract_gzip_with_pigz(pigz, archive_path, filename, extract_path, work_path,
+                           skip_binaries=False):
+    """Extract a .tar.gz, inflating it in a pigz process
+
+    Only decompression leaves Python: the tar stream is still read by
+    extract_archive(), so unsafe and skipped members are filtered as usual.
+    """
+    with subprocess.Popen([pigz, '-dc', str(archive_path)], stdout=subprocess.PIPE,
+                          bufsize=DOWNLOAD_CHUNK_SIZE) as proc:
+        try:
+            extracted = extract_archive(proc.stdout, filename, extract_path, work_path,
+                                        skip_binaries=skip_binaries, archive_kind='r|')
+            # Stream mode stops at the end-of-archive marker; drain any padding
+            # so pigz can exit
+            while proc.stdout.read(1024 * 1024):
+                pass
+        except BaseException:
+            proc.kill()
+            raise
+    if proc.returncode != 0:
+        raise RuntimeError(f"pigz failed to decompress {filename} (exit status {proc.returncode})")
+    return extracted
+
+
+def save_archive(source, archive_path):
+    """Write an archive stream to archive_path unextracted, for TruffleHog to open itself"""
+    with open(archive_path, 'wb') as f:
+        shutil.copyfileobj(source, f, 1024 * 1024)
+
+
+class ArchiveCacheWriter:
+    """Wrap a download stream, copying every byte read from it into the archive cache
+
+    The copy only replaces the cache entry on commit(), after the rest of the
+    download has been drained and its digest (when known) has been checked.
+    """
+
+    def __init__(self, source, cache_path, digest=None):
+        self.source = source
+        self.cache_path = cache_path
+        self.digest = digest
+        self.file = None
+        self.hasher = None
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, self.tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.")
+            except OSError as e:
+                log(f"[WARN] Archive cache unavailable: {e}")
                 return
+            self.file = os.fdopen(fd, 'wb')
+            if digest:
+                self.hasher = hashlib.new(digest[0])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.discard()
+
+    def read(self, size=-1):
+        data = self.source.read(size)
+        if self.file is not None:
+            self.file.write(data)
+            if self.hasher is not None:
+                self.hasher.update(data)
+        return data
+
+    def peek(self, size=0):
+        # Looking ahead consumes nothing, so there is nothing to copy yet
+        return self.source.peek(size)
+
+    def seekable(self):
+        return False
+
+    def commit(self):
+        """Finish the download and move it into the cache if its digest matches"""
+        if self.file is None:
+            return
+        while self.read(DOWNLOAD_CHUNK_SIZE):
+            pass
+        self.file.close()
+        self.file = None
+
+        if self.hasher is not None and self.hasher.hexdigest() != self.digest[1]:
+            log(f"[WARN] {self.digest[0]} mismatch for downloaded archive, not caching it")
+            os.unlink(self.tmp_path)
+            return
+        os.replace(self.tmp_path, self.cache_path)
+
+    def discard(self):
+        """Drop a partially written cache entry"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            os.unlink(self.tmp_path)
+
+
+# Requests a host may receive back to back before --delay spacing applies
+REQUEST_BURST = 5
+
+
+class HostRateLimiter:
+    """Token bucket per host: one request per interval seconds on average, bursts of burst
+
+    Shared by all worker threads, so parallel scans of one registry stay
+    within its rate while requests to different hosts are not held up. Time
+    spent on slow responses earns tokens back, so requests after them don't
+    wait again.
+    """
+
+    def __init__(self, interval, burst=REQUEST_BURST):
+        self.interval = interval
+        self.burst = burst
+        self.lock = threading.Lock()
+        # When each host's bucket will be full again; a request may start
+        # once that is at most burst - 1 intervals away
+        self.refilled_at = {}
+
+    def wait(self, url):
+        """Block until a request to url's host may start"""
+        if self.interval <= 0:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            refilled_at = max(now, self.refilled_at.get(host, now))
+            start = max(now, refilled_at - (self.burst - 1) * self.interval)
+            self.refilled_at[host] = refilled_at + self.interval
+        if start > now:
+            time.sleep(start - now)
 
+
+# Marks a verified finding in a TruffleHog JSON line without parsing it.
+# TruffleHog writes compact JSON, but whitespace around the colon is allowed
+# so a change of encoder can't silently stop the count
+VERIFIED_RE = re.compile(rb'"Verified"\s*:\s*true')
+
+# Discord accepts at most this many embeds in one webhook message
+DISCORD_MAX_EMBEDS = 10
+
+# Seconds the alert sender waits for more alerts to go in the same message
+DISCORD_BATCH_WAIT = 2.0
+
+# The parts of a Discord alert embed that are the same for every alert
+DISCORD_EMBED_TEMPLATE = {
+    "title": "🚨 Verified Secrets Found!",
+    "color": 15158332,  # Red color
+    "footer": {
+        "text": "Package Security Scanner"
+    }
+}
+
+
+class DiscordLogger:
+    def __init__(self, webhook_url=None, session=None):
+        self.webhook_url = webhook_url
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+        # Alerts are posted from a background thread, so scans never wait on
+        # Discord, and alerts close together share one webhook message
+        self.alerts = queue.Queue()
+        self.sender = None
+        self.sender_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def send_alert(self, package_info, verified_count, on_sent=None):
+        """Send alert to Discord when verified secrets are found
+
+        on_sent is called from the sender thread once Discord has accepted it.
+        """
+        if not self.webhook_url or not verified_count:
+            return
+
+        try:
             embed = {
-                "title": "🚨 Verified Secrets Found!",
-                "color": 15158332,  # Red color
+                **DISCORD_EMBED_TEMPLATE,
                 "fields": [
                     {
                         "name": "Package",
@@ -80,109 +653,293 @@ class DiscordLogger:
                         "inline": True
                     }
                 ],
-                "timestamp": datetime.utcnow().isoformat(),
-                "footer": {
-                    "text": "Package Security Scanner"
-                }
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
             }
 
-            payload = {
-                "embeds": [embed],
-                "content": f"**Alert:** Verified secrets detected in {package_info['ecosystem']} package `{package_info['name']}`"
-            }
+            content = f"**Alert:** Verified secrets detected in {package_info['ecosystem']} package `{package_info['name']}`"
 
-            response = self.session.post(self.webhook_url, json=payload)
-            if response.status_code == 204:
-                print("[INFO] Discord alert sent successfully")
-            else:
-                print(f"[WARN] Failed to send Discord alert: {response.status_code}")
+            with self.sender_lock:
+                if self.sender is None:
+                    self.sender = threading.Thread(target=self._send_queued, daemon=True)
+                    self.sender.start()
+            self.alerts.put((embed, content, on_sent))
 
         except Exception as e:
-            print(f"[WARN] Discord logging error: {e}")
+            log(f"[WARN] Discord logging error: {e}")
+
+    def flush(self):
+        """Wait until every queued alert has been posted"""
+        self.alerts.join()
+
+    def _send_queued(self):
+        """Sender thread: post queued alerts, up to DISCORD_MAX_EMBEDS per message"""
+        while True:
+            alerts = [self.alerts.get()]
+            try:
+                while len(alerts) < DISCORD_MAX_EMBEDS:
+                    alerts.append(self.alerts.get(timeout=DISCORD_BATCH_WAIT))
+            except queue.Empty:
+                pass
+
+            try:
+                if self._post(alerts):
+                    for _, _, on_sent in alerts:
+                        if on_sent is not None:
+                            on_sent()
+            except Exception as e:
+                log(f"[WARN] Discord logging error: {e}")
+            finally:
+                for _ in alerts:
+                    self.alerts.task_done()
+
+    def _post(self, alerts):
+        """Post (embed, content, on_sent) alerts as one webhook message, returning True if sent"""
+        if len(alerts) == 1:
+            content = alerts[0][1]
+        else:
+            content = f"**Alert:** Verified secrets detected in {len(alerts)} packages"
+        payload = {
+            "embeds": [embed for embed, _, _ in alerts],
+            "content": content
+        }
+
+        # Compact separators and raw UTF-8 keep the body smaller than requests' json=
+        body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        response = self.session.post(self.webhook_url, data=body,
+                                     headers={'Content-Type': 'application/json'},
+                                     timeout=REQUEST_TIMEOUT)
+        if response.status_code == 204:
+            log("[INFO] Discord alert sent successfully")
+            return True
+        log(f"[WARN] Failed to send Discord alert: {response.status_code}")
+        return False
 
 
 class PackageScanner:
-    def __init__(self, discord_webhook=None):
-        self.temp_dir = Path("/tmp")
+    def __init__(self, discord_webhook=None, jobs=8, use_cache=True, output_format='json',
+                 temp_dir=None, workers=1, request_interval=0, scan_binaries=False,
+                 fail_fast=False, no_extract=False, offline=False, trufflehog_concurrency=None,
+                 include_detectors=None, exclude_detectors=None,
+                 archive_cache_max_mb=ARCHIVE_CACHE_MAX_MB):
+        # requests is imported here rather than at module level: it is the
+        # slowest import by far, and neither --help nor the spawned
+        # extraction workers need it
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.temp_dir = Path(temp_dir) if temp_dir else default_temp_dir()
+        # Every version gets its work directory under this one root, so an
+        # interrupted run leaves nothing behind in temp_dir
+        self.work_root = Path(tempfile.mkdtemp(dir=self.temp_dir, prefix='revelio_'))
+        atexit.register(shutil.rmtree, self.work_root, ignore_errors=True)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'PackageScanner/1.0'
         })
-        self.discord_logger = DiscordLogger(discord_webhook)
-
-    def scan_from_file(self, file_path, ecosystem, version=None, all_versions=False, 
-                      only_verified=False, no_verification=False, delay=1.0):
-        """Scan packages listed in a text file"""
+        # Registries answer bursts of parallel requests with 429/5xx; back off
+        # and retry (honouring Retry-After) instead of failing the version.
+        # Once retries run out the last response is returned as-is, so the
+        # callers' status checks still report it
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'], respect_retry_after_header=True,
+                      raise_on_status=False)
+        # Size the per-host pool to the worker count so parallel downloads keep
+        # their keep-alive connections instead of re-handshaking TLS each time
+        adapter = HTTPAdapter(pool_maxsize=max(jobs * workers, 10), max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Errors from a connection that dropped or stalled mid-download. The
+        # body is read through response.raw, so urllib3's own errors arrive
+        # unwrapped alongside requests' ones
+        self.transient_errors = (requests.ConnectionError, requests.Timeout,
+                                 requests.exceptions.ChunkedEncodingError,
+                                 urllib3.exceptions.ProtocolError,
+                                 urllib3.exceptions.ReadTimeoutError)
+        # Alerts share the scanner's pooled, retrying session
+        self.discord_logger = DiscordLogger(discord_webhook, self.session)
+        # Files ('ec' suffixes) of Maven versions seen in search results
+        self.maven_files = {}
+        # Scan method for each ecosystem name used on the command line
+        self.ecosystem_scanners = {
+            'pypi': self.scan_pypi_package,
+            'npm': self.scan_npm_package,
+            'crates': self.scan_crates_package,
+            'maven': self.scan_maven_package,
+        }
+        self.jobs = jobs
+        self.workers = workers
+        # Paces registry API requests; archive downloads come from CDNs and are not paced
+        self.rate_limiter = HostRateLimiter(request_interval)
+        self.cache_dir = default_cache_dir() if use_cache else None
+        # Size limit for the archive cache in bytes; 0 means no limit
+        self.archive_cache_max_size = archive_cache_max_mb * 1024 * 1024
+        self.archive_cache_lock = threading.Lock()
+        self.output_format = output_format
+        self.scan_binaries = scan_binaries
+        # Hand TruffleHog the archives themselves and let it decompress them
+        self.no_extract = no_extract
+        # Only use the cache: no metadata requests and no downloads
+        self.offline = offline
+        # Set by --fail-fast at the first verified secret, or by Ctrl-C; pending
+        # scans then skip
+        self.fail_fast = fail_fast
+        self.stop_event = threading.Event()
+        # (label, findings) for each version that ran to completion, for the
+        # summary; findings is None when the version was skipped
+        self.scan_results = []
+        # Labels of the versions and packages that raised an error
+        self.failed = []
+        # TruffleHog is CPU heavy, so cap concurrent runs separately from downloads
+        self.trufflehog_slots = threading.Semaphore(os.cpu_count() or 1)
+        # Each run defaults to one detector worker per CPU; runs that start
+        # while others are going get a share instead of oversubscribing them
+        self.trufflehog_running = 0
+        self.trufflehog_running_lock = threading.Lock()
+        # Fixed detector workers per run (--trufflehog-concurrency), if given
+        self.trufflehog_concurrency = trufflehog_concurrency
+        # Comma-separated detector lists passed through to TruffleHog
+        self.include_detectors = include_detectors
+        self.exclude_detectors = exclude_detectors
+        # Replaced by the absolute path once check_trufflehog() finds it
+        self.trufflehog_bin = 'trufflehog'
+        # Part of the scan result cache key; set by check_trufflehog()
+        self.trufflehog_version = None
+        self.results_db_lock = threading.Lock()
+        self.results_db_ready = False
+        # tarfile parses headers in Python under the GIL, so archives already
+        # on disk are extracted in worker processes, started on first use
+        self.extract_pool = None
+        self.extract_pool_lock = threading.Lock()
+        # Archive scans in progress across all packages; a lone one extracts
+        # in this process instead of paying for a worker
+        self.archive_scans_running = 0
+        self.archive_scans_lock = threading.Lock()
+
+    def scan_from_file(self, file_path, ecosystem, version=None, all_versions=False,
+                      only_verified=False, no_verification=False):
+        """Scan packages listed in a text file, requirements file or package.json"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                package_names = [line.strip() for line in f if line.strip()]
-            
-            print(f"[INFO] Found {len(package_names)} packages to scan from {file_path}")
-            
-            for i, package_name in enumerate(package_names, 1):
-                print(f"[INFO] Scanning package {i}/{len(package_names)}: {package_name}")
-                
-                if ecosystem == 'pypi':
-                    self.scan_pypi_package(package_name, version, all_versions, only_verified, no_verification)
-                elif ecosystem == 'npm':
-                    self.scan_npm_package(package_name, version, all_versions, only_verified, no_verification)
-                elif ecosystem == 'crates':
-                    self.scan_crates_package(package_name, version, all_versions, only_verified, no_verification)
-                elif ecosystem == 'maven':
-                    self.scan_maven_package(package_name, version, all_versions, only_verified, no_verification)
-                
-                # Rate limiting between requests
-                if i < len(package_names):
-                    print(f"[INFO] Waiting {delay}s before next package...")
-                    time.sleep(delay)
-                    
+            packages = read_package_list(file_path)
         except FileNotFoundError:
-            print(f"[ERROR] File not found: {file_path}")
+            raise ScannerFatalError(f"File not found: {file_path}") from None
+        except Exception as e:
+            raise ScannerFatalError(f"Error reading file {file_path}: {e}") from e
+
+        print(f"[INFO] Found {len(packages)} packages to scan from {file_path}")
+        self.scan_packages(packages, ecosystem, version, all_versions, only_verified,
+                           no_verification)
+
+    def scan_packages(self, packages, ecosystem, version=None, all_versions=False,
+                      only_verified=False, no_verification=False):
+        """Scan (name, version) pairs, up to self.workers packages at a time
+
+        Each package runs its own download/extract/TruffleHog pipeline, so
+        packages overlap; registry requests are paced by self.rate_limiter.
+        """
+        def scan_one(i, package_name, package_version):
+            log(f"[INFO] Scanning package {i}/{len(packages)}: {package_name}")
+            self.scan_package(ecosystem, package_name, package_version, all_versions,
+                              only_verified, no_verification)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            # Keep only a few packages queued beyond the running ones, so a
+            # long list holds no more futures than that, and --fail-fast
+            # or Ctrl-C leaves nothing queued behind it
+            futures = {}
+            pending = iter(enumerate(packages, 1))
+            while True:
+                while len(futures) < self.workers * 2 and not self.stop_event.is_set():
+                    try:
+                        i, (package_name, pinned_version) = next(pending)
+                    except StopIteration:
+                        break
+                    future = executor.submit(scan_one, i, package_name,
+                                             pinned_version or version)
+                    futures[future] = package_name
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # scan_package() reports and records its own errors
+                    future.result()
+                    del futures[future]
+        except BaseException:
+            self._abandon(executor)
+            raise
+        executor.shutdown()
+
+    def scan_package(self, ecosystem, package_name, version=None, all_versions=False,
+                     only_verified=False, no_verification=False):
+        """Scan one package from the given ecosystem
+
+        Errors are reported and recorded so that other packages still get scanned.
+        """
+        if self.stop_event.is_set():
+            return
+        try:
+            self.ecosystem_scanners[ecosystem](package_name, version, all_versions,
+                                               only_verified, no_verification)
         except Exception as e:
-            print(f"[ERROR] Error reading file {file_path}: {e}")
+            self._package_failed(package_name, f"Error scanning package {package_name}: {e}")
+
+    def _package_failed(self, package_name, message):
+        """Report a package that could not be scanned and record it for the summary"""
+        log(f"[ERROR] {message}")
+        self.failed.append(package_name)
 
     def scan_maven_package(self, package_name, version=None, all_versions=False, only_verified=False,
                           no_verification=False):
         """Scan a Maven package from Maven Central"""
-        print(f"[INFO] Scanning Maven package: {package_name}")
+        log(f"[INFO] Scanning Maven package: {package_name}")
         
         # Parse group_id:artifact_id format
         if ':' not in package_name:
-            print("[ERROR] Maven package name must be in format 'group_id:artifact_id'")
+            self._package_failed(package_name, "Maven package name must be in format "
+                                               "'group_id:artifact_id'")
             return
         
         group_id, artifact_id = package_name.split(':', 1)
-        print(f"[INFO] Group ID: {group_id}, Artifact ID: {artifact_id}")
+        log(f"[INFO] Group ID: {group_id}, Artifact ID: {artifact_id}")
         
         if all_versions:
             # Get all versions using Maven Central Search API
             versions = self._get_all_maven_versions(group_id, artifact_id)
             if not versions:
-                print("[ERROR] No versions found")
+                self._package_failed(package_name, f"No versions found for {package_name}")
                 return
-            print(f"[INFO] Found {len(versions)} versions")
+            log(f"[INFO] Found {len(versions)} versions")
         elif version:
             versions = [version]
         else:
             # Get latest version
             latest_version = self._get_latest_maven_version(group_id, artifact_id)
             if not latest_version:
-                print("[ERROR] Could not determine latest version")
+                self._package_failed(package_name,
+                                     f"Could not determine latest version of {package_name}")
                 return
             versions = [latest_version]
         
+        # Versions are independent, so scan them the same way as the other
+        # ecosystems
+        tasks = []
         for ver in versions:
-            print(f"[INFO] Scanning version {ver}")
-            
+            log(f"[INFO] Scanning version {ver}")
+
             package_info = {
                 'name': package_name,
                 'version': ver,
                 'ecosystem': 'Maven Central'
             }
-            
+
             # Try to download different artifact types (JAR, sources, etc.)
-            self._scan_maven_artifacts(group_id, artifact_id, ver, package_info, 
-                                     only_verified, no_verification)
+            tasks.append((f"{package_name}:{ver}", self._scan_maven_artifacts,
+                          (group_id, artifact_id, ver, package_info, only_verified,
+                           no_verification)))
+        self._run_version_scans(tasks)
 
     def _get_all_maven_versions(self, group_id, artifact_id):
         """Get all versions for a Maven artifact"""
@@ -191,26 +948,28 @@ class PackageScanner:
             search_url = "https://search.maven.org/solrsearch/select"
             params = {
                 'q': f'g:"{group_id}" AND a:"{artifact_id}"',
+                'core': 'gav',  # One document per version, not per artifact
                 'rows': 1000,  # Should be enough for most artifacts
                 'wt': 'json',
-                'fl': 'v,timestamp',
+                'fl': 'v,timestamp,ec',
                 'sort': 'timestamp desc'  # Newest first
             }
             
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(search_url, params=params, max_age=MAVEN_SEARCH_TTL)
+            if data is None:
+                return []
             
             versions = []
             for doc in data['response']['docs']:
                 version = doc.get('v', '')
                 if version:
                     versions.append(version)
+                    self._note_maven_files(group_id, artifact_id, version, doc)
             
             return versions
             
         except Exception as e:
-            print(f"[ERROR] Failed to get Maven versions: {e}")
+            log(f"[ERROR] Failed to get Maven versions: {e}")
             return []
 
     def _get_latest_maven_version(self, group_id, artifact_id):
@@ -221,29 +980,47 @@ class PackageScanner:
                 'q': f'g:"{group_id}" AND a:"{artifact_id}"',
                 'rows': 1,
                 'wt': 'json',
-                'fl': 'latestVersion'
+                'fl': 'latestVersion,ec'
             }
             
-            response = self.session.get(search_url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(search_url, params=params, max_age=MAVEN_SEARCH_TTL)
+            if data is None:
+                return None
             
             docs = data['response']['docs']
             if docs:
-                return docs[0].get('latestVersion', '')
+                latest_version = docs[0].get('latestVersion', '')
+                self._note_maven_files(group_id, artifact_id, latest_version, docs[0])
+                return latest_version
             
             return None
             
         except Exception as e:
-            print(f"[ERROR] Failed to get latest Maven version: {e}")
+            log(f"[ERROR] Failed to get latest Maven version: {e}")
             return None
 
+    def _note_maven_files(self, group_id, artifact_id, version, doc):
+        """Remember which files a search result says a version has (its 'ec' list)"""
+        if doc.get('ec'):
+            self.maven_files[(group_id, artifact_id, version)] = frozenset(doc['ec'])
+
     def _scan_maven_artifacts(self, group_id, artifact_id, version, package_info, 
                              only_verified=False, no_verification=False):
-        """Download and scan different Maven artifact types"""
+        """Download the Maven artifact types for one version and scan them together
+
+        Returns the number of findings, or None if the version was skipped.
+        """
+        if self.stop_event.is_set():
+            return None
         # Convert group_id to path format
         group_path = group_id.replace('.', '/')
         base_url = f"https://repo1.maven.org/maven2/{group_path}/{artifact_id}/{version}"
+        coordinates = f"{group_id}:{artifact_id}:{version}"
+
+        if self.offline:
+            # Maven artifacts are not kept in the archive cache
+            log(f"[WARN] Skipping {coordinates}: Maven artifacts are not cached (--offline)")
+            return None
         
         # Artifact types to try (in order of preference for secret scanning)
         artifact_types = [
@@ -251,177 +1028,153 @@ class PackageScanner:
             ('jar', 'Main JAR'),            # Compiled code but may have resources
             ('pom', 'POM file'),            # May contain credentials/URLs
         ]
-        
-        scanned_any = False
-        
-        for artifact_type, description in artifact_types:
-            if artifact_type == 'sources.jar':
-                filename = f"{artifact_id}-{version}-sources.jar"
-            elif artifact_type == 'pom':
-                filename = f"{artifact_id}-{version}.pom"
-            else:
-                filename = f"{artifact_id}-{version}.jar"
-            
-            download_url = f"{base_url}/{filename}"
-            
-            print(f"[INFO] Trying to download {description}: {filename}")
-            
-            # Check if artifact exists
-            try:
-                head_response = self.session.head(download_url)
-                if head_response.status_code != 200:
-                    print(f"[WARN] {description} not available (HTTP {head_response.status_code})")
-                    continue
-            except Exception as e:
-                print(f"[WARN] Error checking {description}: {e}")
-                continue
-            
-            # Download and scan this artifact
-            package_identifier = f"{group_id.replace('.', '-')}-{artifact_id}-{version}-{artifact_type.replace('.', '-')}"
-            
-            try:
-                self._download_and_scan_maven_artifact(
-                    download_url, package_identifier, description, 
-                    only_verified, no_verification, package_info, artifact_type
-                )
-                scanned_any = True
-                
-            except Exception as e:
-                print(f"[ERROR] Failed to scan {description}: {e}")
-                continue
-        
-        if not scanned_any:
-            print(f"[ERROR] No artifacts could be downloaded for {group_id}:{artifact_id}:{version}")
-
-    def _download_and_scan_maven_artifact(self, url, package_identifier, description, 
-                                         only_verified=False, no_verification=False, 
-                                         package_info=None, artifact_type=None):
-        """Download and scan a specific Maven artifact"""
-        work_dir = None
-        try:
-            # Create temporary working directory
-            work_dir = tempfile.mkdtemp(dir=self.temp_dir, prefix=f"maven_scan_{package_identifier}_")
+
+        # When a search already listed the version's files, only ask for those
+        # instead of finding missing ones (often the sources JAR) by a 404
+        files = self.maven_files.get((group_id, artifact_id, version))
+        if files is not None:
+            artifact_types = [(artifact_type, description)
+                              for artifact_type, description in artifact_types
+                              if MAVEN_FILE_SUFFIXES[artifact_type] in files]
+            if not artifact_types:
+                raise RuntimeError(f"no scannable artifacts listed for {coordinates}")
+
+        # One working directory per version, with a subdirectory per artifact,
+        # so a single TruffleHog run covers every artifact of the version
+        package_identifier = f"{group_id.replace('.', '-')}-{artifact_id}-{version}"
+        with tempfile.TemporaryDirectory(dir=self.work_root,
+                                         prefix=f"maven_scan_{package_identifier}_") as work_dir:
             work_path = Path(work_dir)
+            extract_root = work_path / "extracted"
+            extract_root.mkdir()
+
+            scanned_any = False
+
+            # The artifacts are independent downloads into separate
+            # subdirectories, so fetch and extract them at the same time
+            with ThreadPoolExecutor(max_workers=len(artifact_types)) as executor:
+                futures = {}
+                for artifact_type, description in artifact_types:
+                    if artifact_type == 'sources.jar':
+                        filename = f"{artifact_id}-{version}-sources.jar"
+                    elif artifact_type == 'pom':
+                        filename = f"{artifact_id}-{version}.pom"
+                    else:
+                        filename = f"{artifact_id}-{version}.jar"
+
+                    download_url = f"{base_url}/{filename}"
+
+                    log(f"[INFO] Trying to download {description}: {filename}")
 
-            print(f"[INFO] Downloading {description} from {url}")
+                    extract_path = extract_root / artifact_type.replace('.', '-')
+                    future = executor.submit(self._retry_transient, description,
+                                             self._download_maven_artifact, download_url,
+                                             description, artifact_type, work_path,
+                                             extract_path)
+                    futures[future] = description
 
-            # Download the artifact
-            response = self.session.get(url, stream=True)
+                for future in as_completed(futures):
+                    try:
+                        if future.result():
+                            scanned_any = True
+                    except Exception as e:
+                        log(f"[ERROR] Failed to download {futures[future]}: {e}")
+
+            if not scanned_any:
+                raise RuntimeError(f"no artifacts could be downloaded for {coordinates}")
+
+            log(f"[INFO] Running TruffleHog scan on {coordinates}")
+            return self._run_trufflehog(extract_root, coordinates, only_verified,
+                                        no_verification, package_info)
+
+    def _download_maven_artifact(self, url, description, artifact_type, work_path, extract_path):
+        """Download a Maven artifact and unpack it into extract_path, returning True on success"""
+        log(f"[INFO] Downloading {description} from {url}")
+
+        # Download the artifact; a missing one is found out from this GET
+        # rather than a HEAD request first
+        with self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 404:
+                log(f"[WARN] {description} not available (HTTP 404)")
+                return False
             response.raise_for_status()
+            if not self._fits_in_temp_dir(response, description):
+                return False
+
+            # A retried download starts again from an empty directory
+            shutil.rmtree(extract_path, ignore_errors=True)
+            extract_path.mkdir()
 
             # Determine filename and handling
             if artifact_type == 'pom':
-                filename = f"{package_identifier}.pom"
-                extract_path = work_path / "extracted"
-                extract_path.mkdir()
-                
                 # POM files are XML, save directly
                 pom_path = extract_path / "pom.xml"
-                with open(pom_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-            else:
-                # JAR files (including sources.jar)
-                filename = f"{package_identifier}.jar"
-                archive_path = work_path / filename
-
-                # Save the downloaded file
-                with open(archive_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-
-                print(f"[INFO] Extracting {description}")
-
-                # Extract the JAR file (JARs are ZIP files)
-                extract_path = work_path / "extracted"
-                extract_path.mkdir()
-
-                try:
-                    with zipfile.ZipFile(archive_path, 'r') as jar:
-                        jar.extractall(extract_path)
-                except zipfile.BadZipFile:
-                    print(f"[WARN] {description} is not a valid ZIP/JAR file")
-                    return
-
-            print(f"[INFO] Running TruffleHog scan on {description}")
-
-            # Build TruffleHog command
-            trufflehog_cmd = [
-                'trufflehog',
-                'filesystem',
-                str(extract_path),
-                '--no-update',
-                '--json'
-            ]
-
-            # Add verification flags
-            if only_verified:
-                trufflehog_cmd.append('--only-verified')
-            elif no_verification:
-                trufflehog_cmd.append('--no-verification')
-
-            # Run TruffleHog
-            result = subprocess.run(trufflehog_cmd, capture_output=True, text=True)
-
-            if result.stdout:
-                print(f"[RESULTS] TruffleHog Results for {description}:")
-                print(result.stdout)
-                
-                # Send Discord alert if verified secrets found
-                if package_info:
-                    self.discord_logger.send_alert(package_info, result.stdout)
-            else:
-                print(f"[RESULTS] No secrets found in {description}")
-
-            if result.stderr:
-                print(f"[WARN] TruffleHog stderr for {description}:")
-                print(result.stderr)
-
-        except Exception as e:
-            print(f"[ERROR] Error scanning {description} for {package_identifier}: {e}")
-        finally:
-            # Cleanup
-            if work_dir and os.path.exists(work_dir):
-                print(f"[INFO] Cleaning up {work_dir}")
-                shutil.rmtree(work_dir)
+                # POMs are a few KB: one read of the whole body, one write
+                pom_path.write_bytes(response.content)
+                return True
+
+            response.raw.decode_content = True
+            if self.no_extract:
+                save_archive(response.raw, extract_path / Path(urlparse(url).path).name)
+                return True
+
+            log(f"[INFO] Extracting {description}")
+
+            # JAR files (including sources.jar) are ZIP files. They go through
+            # the same in-memory spool as other zips instead of being saved
+            # to the work directory and read back
+            response.raw.auto_close = False
+            stream = io.BufferedReader(response.raw, buffer_size=DOWNLOAD_CHUNK_SIZE)
+            size = int(response.headers.get('Content-Length') or 0)
+            try:
+                return extract_archive(stream, f"{extract_path.name}.jar", extract_path,
+                                       work_path, size, not self.scan_binaries)
+            except zipfile.BadZipFile:
+                log(f"[WARN] {description} is not a valid ZIP/JAR file")
+                return False
 
     def scan_crates_package(self, package_name, version=None, all_versions=False, only_verified=False,
                            no_verification=False):
         """Scan a Rust crate from crates.io"""
-        print(f"[INFO] Scanning Rust crate: {package_name}")
+        log(f"[INFO] Scanning Rust crate: {package_name}")
 
         # Get crate metadata
         url = f"https://crates.io/api/v1/crates/{package_name}"
-        response = self.session.get(url)
-
-        if response.status_code != 200:
-            print(f"[ERROR] Failed to fetch crate metadata: {response.status_code}")
+        data = self._get_json(url)
+        if data is None:
+            self.failed.append(package_name)
             return
-
-        data = response.json()
         crate_info = data['crate']
 
-        if all_versions:
+        # The crate document lists every published version with its sha256
+        # checksum, so --all-versions needs no second request to /versions
+        checksums = {v['num']: v.get('checksum') for v in data.get('versions') or []}
+        if all_versions and not checksums:
+            # Some documents come without the list; the versions endpoint has it
+            versions_data = self._get_json(f"{url}/versions")
+            if versions_data is not None:
+                checksums = {v['num']: v.get('checksum')
+                             for v in versions_data.get('versions') or []}
+            if not checksums:
+                log(f"[WARN] No version list for {package_name}; scanning only the newest version")
+
+        if all_versions and checksums:
             # Get all versions
-            versions_url = f"https://crates.io/api/v1/crates/{package_name}/versions"
-            versions_response = self.session.get(versions_url)
-            if versions_response.status_code == 200:
-                versions_data = versions_response.json()
-                versions = [v['num'] for v in versions_data['versions']]
-                print(f"[INFO] Found {len(versions)} versions")
-            else:
-                versions = [crate_info['newest_version']]
+            versions = list(checksums)
+            log(f"[INFO] Found {len(versions)} versions")
         elif version:
             versions = [version]
         else:
             versions = [crate_info['newest_version']]  # Latest version
 
+        scan_jobs = []
         for ver in versions:
-            print(f"[INFO] Scanning version {ver}")
-            
-            # Download URL for .crate file
-            download_url = f"https://crates.io/api/v1/crates/{package_name}/{ver}/download"
+            digest = ('sha256', checksums[ver]) if checksums.get(ver) else None
+
+            # Download URL for .crate file. This is the CDN address cargo uses
+            # (the index's "dl" template); the crates.io API's /download
+            # endpoint only redirects there, a serial round trip per version
+            download_url = f"https://static.crates.io/crates/{package_name}/{ver}/download"
             
             package_info = {
                 'name': package_name,
@@ -429,48 +1182,76 @@ class PackageScanner:
                 'ecosystem': 'crates.io'
             }
             
-            self._download_and_scan(download_url, f"{package_name}-{ver}", only_verified, 
-                                  no_verification, package_info, is_crate=True)
+            scan_jobs.append((download_url, f"{package_name}-{ver}", package_info, digest))
+
+        # Only scan_jobs is needed from here; don't hold the parsed metadata
+        # for the whole (possibly long) scan
+        del data, crate_info, checksums
+        self._scan_versions(scan_jobs, only_verified, no_verification, is_crate=True)
 
     def scan_pypi_package(self, package_name, version=None, all_versions=False, only_verified=False,
                           no_verification=False):
         """Scan a PyPI package"""
-        print(f"[INFO] Scanning PyPI package: {package_name}")
-
-        # Get package metadata
-        url = f"https://pypi.org/pypi/{package_name}/json"
-        response = self.session.get(url)
-
-        if response.status_code != 200:
-            print(f"[ERROR] Failed to fetch package metadata: {response.status_code}")
-            return
-
-        data = response.json()
-
-        if all_versions:
-            versions = list(data['releases'].keys())
-            print(f"[INFO] Found {len(versions)} versions")
-        elif version:
-            versions = [version] if version in data['releases'] else []
-            if not versions:
-                print(f"[ERROR] Version {version} not found")
+        log(f"[INFO] Scanning PyPI package: {package_name}")
+
+        if version and not all_versions:
+            # A pinned version only needs that release's files, not every release
+            url = f"https://pypi.org/pypi/{package_name}/{version}/json"
+            data = self._get_json(url)
+            if data is None:
+                self.failed.append(package_name)
                 return
+            versions = [version]
+            files_by_version = {version: data['urls']}
+        elif all_versions and (simple := self._get_pypi_simple_files(package_name)):
+            # The simple index lists every file without per-release metadata,
+            # a fraction of the size of the JSON API's "releases"
+            data, files_by_version = simple
+            # Indexes older than PEP 700 have no version list; the file names
+            # are all there is then
+            versions = data.get('versions') or list(files_by_version)
+            log(f"[INFO] Found {len(versions)} versions")
+            # A listed version whose sdist name couldn't be matched to it may
+            # still have one; the JSON API's releases say for sure, all in
+            # one request
+            if any(ver not in files_by_version for ver in versions):
+                releases = self._get_json(f"https://pypi.org/pypi/{package_name}/json")
+                if releases is not None:
+                    for ver in versions:
+                        if ver not in files_by_version:
+                            files_by_version[ver] = releases['releases'].get(ver, [])
+                del releases
         else:
-            versions = [data['info']['version']]  # Latest version
+            # Get package metadata
+            url = f"https://pypi.org/pypi/{package_name}/json"
+            data = self._get_json(url)
+            if data is None:
+                self.failed.append(package_name)
+                return
 
+            if all_versions:
+                versions = list(data['releases'].keys())
+                log(f"[INFO] Found {len(versions)} versions")
+            else:
+                versions = [data['info']['version']]  # Latest version
+            files_by_version = data['releases']
+
+        scan_jobs = []
         for ver in versions:
-            print(f"[INFO] Scanning version {ver}")
-            releases = data['releases'][ver]
+            releases = files_by_version.get(ver, [])
 
             # Find source distribution (prefer .tar.gz)
             source_url = None
+            digest = None
             for release in releases:
                 if release['packagetype'] == 'sdist':
                     source_url = release['url']
+                    sha256 = release.get('digests', {}).get('sha256')
+                    digest = ('sha256', sha256) if sha256 else None
                     break
 
             if not source_url:
-                print(f"[WARN] No source distribution found for version {ver}")
+                log(f"[WARN] No source distribution found for version {ver}")
                 continue
 
             package_info = {
@@ -479,13 +1260,65 @@ class PackageScanner:
                 'ecosystem': 'PyPI'
             }
 
-            self._download_and_scan(source_url, f"{package_name}-{ver}", only_verified, 
-                                  no_verification, package_info)
+            scan_jobs.append((source_url, f"{package_name}-{ver}", package_info, digest))
+
+        # Only scan_jobs is needed from here; don't hold the parsed metadata
+        # for the whole (possibly long) scan
+        del data, files_by_version
+        self._scan_versions(scan_jobs, only_verified, no_verification)
+
+    def _get_pypi_simple_files(self, package_name):
+        """Read the PEP 691 JSON simple index: (index, sdist files by version), or None
+
+        The sdists are shaped like the JSON API's release files, so both feed
+        the same loop in scan_pypi_package.
+        """
+        url = f"https://pypi.org/simple/{package_name}/"
+        try:
+            data = self._get_json(url, accept='application/vnd.pypi.simple.v1+json')
+        except ValueError:
+            # An index that only serves HTML; the JSON API still works
+            return None
+        if data is None:
+            return None
+
+        # Other archives that share the sdist suffixes, such as bdist_dumb's
+        # "pkg-1.0.win32.zip", don't split into a listed version. File names
+        # may spell a version differently from the list ("0.15.1-post1" for
+        # "0.15.1.post1"), so both sides are compared with their separators
+        # normalized, as project names are
+        project = PROJECT_NAME_SEPARATORS_RE.sub('-', package_name).lower()
+        listed = ({PROJECT_NAME_SEPARATORS_RE.sub('-', v).lower(): v for v in data['versions']}
+                  if data.get('versions') else None)
+        files_by_version = {}
+        for file in data.get('files', []):
+            filename = file['filename']
+            suffix = next((s for s in SDIST_SUFFIXES if filename.endswith(s)), None)
+            if suffix is None:
+                continue
+            # The version can itself contain '-', so split after the project
+            # name rather than at the last '-'
+            stem = filename[:-len(suffix)]
+            ver = next((stem[i + 1:] for i, char in enumerate(stem) if char == '-'
+                        and PROJECT_NAME_SEPARATORS_RE.sub('-', stem[:i]).lower() == project),
+                       None)
+            if not ver:
+                continue
+            if listed is not None:
+                ver = listed.get(PROJECT_NAME_SEPARATORS_RE.sub('-', ver).lower())
+                if ver is None:
+                    continue
+            files_by_version.setdefault(ver, []).append({
+                'packagetype': 'sdist',
+                'url': file['url'],
+                'digests': file.get('hashes', {}),
+            })
+        return data, files_by_version
 
     def scan_npm_package(self, package_name, version=None, all_versions=False, only_verified=False,
                          no_verification=False):
         """Scan an npm package"""
-        print(f"[INFO] Scanning npm package: {package_name}")
+        log(f"[INFO] Scanning npm package: {package_name}")
 
         # Handle scoped packages
         if package_name.startswith('@'):
@@ -493,147 +1326,603 @@ class PackageScanner:
         else:
             encoded_name = package_name
 
-        # Get package metadata
+        # Get package metadata. The abbreviated document only carries what
+        # installers need (versions, dist-tags, dist), a fraction of the full one
         url = f"https://registry.npmjs.org/{encoded_name}"
-        response = self.session.get(url)
-
-        if response.status_code != 200:
-            print(f"[ERROR] Failed to fetch package metadata: {response.status_code}")
+        data = self._get_json(url, accept='application/vnd.npm.install-v1+json')
+        if data is None:
+            self.failed.append(package_name)
             return
 
-        data = response.json()
-
         if all_versions:
             versions = list(data['versions'].keys())
-            print(f"[INFO] Found {len(versions)} versions")
+            log(f"[INFO] Found {len(versions)} versions")
         elif version:
             versions = [version] if version in data['versions'] else []
             if not versions:
-                print(f"[ERROR] Version {version} not found")
+                self._package_failed(package_name, f"Version {version} of {package_name} not found")
                 return
         else:
             versions = [data['dist-tags']['latest']]  # Latest version
 
+        scan_jobs = []
         for ver in versions:
-            print(f"[INFO] Scanning version {ver}")
             version_data = data['versions'][ver]
             tarball_url = version_data['dist']['tarball']
 
+            # Prefer the SRI sha512 over the legacy sha1 shasum
+            integrity = version_data['dist'].get('integrity', '')
+            if integrity.startswith('sha512-'):
+                digest = ('sha512', base64.b64decode(integrity[len('sha512-'):]).hex())
+            elif version_data['dist'].get('shasum'):
+                digest = ('sha1', version_data['dist']['shasum'])
+            else:
+                digest = None
+
             package_info = {
                 'name': package_name,
                 'version': ver,
                 'ecosystem': 'npm'
             }
 
-            self._download_and_scan(tarball_url, f"{package_name.replace('/', '-')}-{ver}", 
-                                  only_verified, no_verification, package_info)
+            scan_jobs.append((tarball_url, f"{package_name.replace('/', '-')}-{ver}", package_info, digest))
 
-    def _download_and_scan(self, url, package_identifier, only_verified=False, no_verification=False, 
-                          package_info=None, is_crate=False):
-        """Download package, extract, scan with TruffleHog, and cleanup"""
-        work_dir = None
+        # Only scan_jobs is needed from here; don't hold the parsed metadata
+        # for the whole (possibly long) scan
+        del data
+        self._scan_versions(scan_jobs, only_verified, no_verification)
+
+    def _get_json(self, url, accept=None, params=None, max_age=0):
+        """Fetch registry metadata, revalidating a cached copy with its ETag or Last-Modified
+
+        A cached copy younger than max_age seconds is returned without a request.
+        """
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        headers = {'Accept': accept} if accept else {}
+        body_path = None
+        if self.cache_dir is not None:
+            # The same URL can serve different documents depending on Accept
+            cache_key = hashlib.sha1(f"{url}\n{accept or ''}".encode()).hexdigest()
+            body_path = self.cache_dir / 'metadata' / f"{cache_key}.json"
+            validators_path = self.cache_dir / 'metadata' / f"{cache_key}.validators"
+            if self.offline:
+                if not body_path.exists():
+                    log(f"[ERROR] No cached metadata for {url} (--offline)")
+                    return None
+                return json.loads(body_path.read_bytes())
+            if (max_age and body_path.exists()
+                    and time.time() - body_path.stat().st_mtime < max_age):
+                return json.loads(body_path.read_bytes())
+            if body_path.exists() and validators_path.exists():
+                validators = json.loads(validators_path.read_bytes())
+                if validators.get('etag'):
+                    headers['If-None-Match'] = validators['etag']
+                if validators.get('last_modified'):
+                    headers['If-Modified-Since'] = validators['last_modified']
+
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 304:
+            if body_path is not None and body_path.exists():
+                return json.loads(body_path.read_bytes())
+            # Not Modified with no copy to reuse, e.g. from a caching proxy;
+            # ask again for the document itself
+            headers = {'Accept': accept} if accept else {}
+            headers['Cache-Control'] = 'no-cache'
+            self.rate_limiter.wait(url)
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code != 200:
+            log(f"[ERROR] Failed to fetch package metadata from {url}: HTTP {response.status_code}")
+            return None
+
+        data = response.json()
+
+        # Stored even without validators: --offline reads it, while online
+        # runs only reuse it within max_age or after a 304
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if self.cache_dir is not None:
+            try:
+                write_atomic(body_path, response.content)
+                write_atomic(validators_path, json.dumps(validators).encode())
+            except OSError as e:
+                log(f"[WARN] Could not cache metadata for {url}: {e}")
+
+        return data
+
+    def _fits_in_temp_dir(self, response, label):
+        """Refuse downloads whose advertised size exceeds the free space in temp_dir"""
+        content_length = int(response.headers.get('Content-Length') or 0)
+        free = shutil.disk_usage(self.temp_dir).free
+        if content_length > free:
+            log(f"[WARN] Skipping {label}: download is {content_length} bytes but only "
+                f"{free} bytes are free in {self.temp_dir}")
+            return False
+        return True
+
+    def _archive_cache_path(self, url, digest=None):
+        """Cache location for an archive, keyed by its registry digest or else its URL"""
+        if self.cache_dir is None:
+            return None
+        if digest:
+            algorithm, hexdigest = digest
+            key = f"{algorithm}-{hexdigest}"
+        else:
+            key = f"url-{hashlib.sha256(url.encode()).hexdigest()}"
+        return self.cache_dir / 'archives' / key
+
+    def _touch_cached_archive(self, archive_path):
+        """Mark a cached archive as just used, so pruning removes it last"""
         try:
-            # Create temporary working directory
-            work_dir = tempfile.mkdtemp(dir=self.temp_dir, prefix=f"scan_{package_identifier}_")
-            work_path = Path(work_dir)
+            os.utime(archive_path)
+        except OSError:
+            pass
 
-            print(f"[INFO] Downloading {url}")
+    def _prune_archive_cache(self, keep):
+        """Delete the least recently used cached archives (never keep) until under the limit"""
+        if not self.archive_cache_max_size:
+            return
+        with self.archive_cache_lock:
+            entries = []
+            try:
+                with os.scandir(keep.parent) as it:
+                    for entry in it:
+                        # Dot files are downloads still being written
+                        if entry.name.startswith('.') or not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError as e:
+                log(f"[WARN] Could not check archive cache size: {e}")
+                return
 
-            # Download the package
-            response = self.session.get(url, stream=True)
-            response.raise_for_status()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.archive_cache_max_size:
+                    break
+                if path == str(keep):
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    log(f"[WARN] Could not prune cached archive {path}: {e}")
+                    continue
+                total -= size
+
+    def _extract_cached_archive(self, archive_path, filename, extract_path, work_path):
+        """Extract a cached archive, in a worker process when scans run concurrently"""
+        with self.archive_scans_lock:
+            alone = self.archive_scans_running <= 1
+        if alone:
+            # Nothing running alongside, so skip the worker start-up cost
+            return extract_archive_file(archive_path, filename, extract_path, work_path,
+                                        not self.scan_binaries)
+
+        with self.extract_pool_lock:
+            if self.extract_pool is None:
+                # Forking a process with live download threads can copy their
+                # held locks into the child; spawn starts clean
+                self.extract_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context('spawn'))
+        return self.extract_pool.submit(extract_archive_file, archive_path, filename,
+                                        extract_path, work_path, not self.scan_binaries).result()
+
+    def _scan_versions(self, scan_jobs, only_verified=False, no_verification=False, is_crate=False):
+        """Download and scan package versions concurrently on a bounded worker pool"""
+        tasks = []
+        for url, package_identifier, package_info, digest in scan_jobs:
+            log(f"[INFO] Scanning version {package_info['version']}")
+            tasks.append((package_identifier, self._download_and_scan,
+                          (url, package_identifier, only_verified, no_verification, package_info,
+                           is_crate, digest)))
+        self._run_version_scans(tasks)
+
+    def _run_version_scans(self, tasks):
+        """Run (label, function, args) version scans, up to self.jobs at a time
+
+        A failed version is reported and recorded, and the others carry on.
+        """
+        if len(tasks) <= 1 or self.jobs == 1:
+            # Nothing to overlap (the common latest-version scan), so run in
+            # this thread instead of starting a pool
+            for label, function, args in tasks:
+                try:
+                    self._record_version(label, function(*args))
+                except Exception as e:
+                    self._record_version(label, error=e)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+            futures = {executor.submit(function, *args): label for label, function, args in tasks}
+            for future in as_completed(futures):
+                try:
+                    self._record_version(futures[future], future.result())
+                except Exception as e:
+                    self._record_version(futures[future], error=e)
+        except BaseException:
+            self._abandon(executor)
+            raise
+        executor.shutdown()
+
+    def _abandon(self, executor):
+        """On Ctrl-C, drop a pool's queued scans and stop the running ones at their next check
+
+        Leaving a with block would instead wait for every queued scan to run.
+        """
+        self.stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record_version(self, label, findings=None, error=None):
+        """Note how a version scan ended, for print_summary()"""
+        if error is not None:
+            log(f"[ERROR] Error scanning {label}: {error}")
+            self.failed.append(label)
+        else:
+            log(f"[INFO] Finished {label}")
+            self.scan_results.append((label, findings))
+
+    def print_summary(self):
+        """Print how many versions were scanned, skipped or failed, naming the exceptions"""
+        scanned = [(label, findings) for label, findings in self.scan_results
+                   if findings is not None]
+        with_findings = [(label, findings) for label, findings in scanned if findings]
+        skipped = len(self.scan_results) - len(scanned)
+        print(f"[RESULTS] Summary: {len(scanned)} scanned, {len(with_findings)} with findings, "
+              f"{skipped} skipped, {len(self.failed)} failed")
+        for label, findings in with_findings:
+            print(f"[RESULTS]   {label}: {findings} finding{'s' if findings != 1 else ''}")
+        for label in self.failed:
+            print(f"[RESULTS]   {label}: failed")
 
-            # Determine file extension
+    def _download_and_scan(self, url, package_identifier, only_verified=False, no_verification=False, 
+                          package_info=None, is_crate=False, digest=None):
+        """Download package, extract, scan with TruffleHog, and cleanup
+
+        Returns the number of findings, or None if the version was skipped.
+        """
+        if self.stop_event.is_set():
+            return None
+
+        # An archive with the same digest, scanned the same way, gives the same
+        # findings, so a recent stored result stands in for the whole scan
+        result_key = self._scan_result_key(digest, only_verified, no_verification)
+        if result_key:
+            findings = self._replay_scan_result(result_key, package_identifier, package_info)
+            if findings is not None:
+                return findings
+
+        with self.archive_scans_lock:
+            self.archive_scans_running += 1
+        try:
+            return self._retry_transient(package_identifier, self._scan_archive, url,
+                                         package_identifier, only_verified, no_verification,
+                                         package_info, is_crate, digest, result_key)
+        finally:
+            with self.archive_scans_lock:
+                self.archive_scans_running -= 1
+
+    def _retry_transient(self, label, function, *args):
+        """Call function(*args), retrying with exponential backoff if its connection drops"""
+        for attempt in range(DOWNLOAD_ATTEMPTS):
+            try:
+                return function(*args)
+            except self.transient_errors as e:
+                if attempt == DOWNLOAD_ATTEMPTS - 1 or self.stop_event.is_set():
+                    raise
+                delay = 2 ** attempt
+                log(f"[WARN] Download of {label} failed ({e}), retrying in {delay}s")
+                time.sleep(delay)
+
+    def _scan_archive(self, url, package_identifier, only_verified, no_verification,
+                      package_info, is_crate, digest, result_key):
+        """Fetch one archive into a fresh work directory and run TruffleHog on it
+
+        Returns the number of findings, or None if the archive was skipped.
+        """
+        # Create temporary working directory
+        with tempfile.TemporaryDirectory(dir=self.work_root,
+                                         prefix=f"scan_{package_identifier}_") as work_dir:
+            work_path = Path(work_dir)
+
+            # The name is only a fallback: the format is sniffed from the first bytes
             if is_crate:
                 filename = f"{package_identifier}.crate"
             else:
-                parsed_url = urlparse(url)
-                filename = Path(parsed_url.path).name
-                if not filename or '.' not in filename:
-                    # Try to determine from content-type or default to .tar.gz
-                    content_type = response.headers.get('content-type', '')
-                    if 'zip' in content_type:
-                        filename = f"{package_identifier}.zip"
-                    else:
-                        filename = f"{package_identifier}.tar.gz"
-
-            archive_path = work_path / filename
-
-            # Save the downloaded file
-            with open(archive_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                filename = Path(urlparse(url).path).name or package_identifier
 
-            print(f"[INFO] Extracting {filename}")
+            cache_path = self._archive_cache_path(url, digest)
 
-            # Extract the archive
             extract_path = work_path / "extracted"
             extract_path.mkdir()
 
-            if filename.endswith('.crate') or filename.endswith(('.tar.gz', '.tgz', '.tar')):
-                # .crate files are gzipped tarballs
-                with tarfile.open(archive_path, 'r:gz') as tar:
-                    tar.extractall(extract_path)
-            elif filename.endswith('.zip'):
-                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_path)
+            scan_path = extract_path
+            if cache_path and cache_path.exists():
+                log(f"[INFO] Using cached archive {cache_path.name} for {package_identifier}")
+                self._touch_cached_archive(cache_path)
+                if self.no_extract:
+                    scan_path = cache_path
+                else:
+                    log(f"[INFO] Extracting {filename}")
+                    if not self._extract_cached_archive(cache_path, filename, extract_path,
+                                                        work_path):
+                        return None
+            elif self.offline:
+                log(f"[WARN] Skipping {package_identifier}: archive is not cached (--offline)")
+                return None
             else:
-                print(f"[WARN] Unsupported archive format: {filename}")
-                return
+                log(f"[INFO] Downloading {url}")
+
+                # Download the package
+                with self.session.get(url, stream=True,
+                                      timeout=REQUEST_TIMEOUT) as response:
+                    response.raise_for_status()
+                    if not self._fits_in_temp_dir(response, package_identifier):
+                        return None
+                    response.raw.decode_content = True
+                    # Let the io wrapper below see EOF instead of a closed file
+                    response.raw.auto_close = False
+
+                    # Extract the archive while it downloads, copying it into the
+                    # cache on the way through
+                    stream = io.BufferedReader(response.raw, buffer_size=DOWNLOAD_CHUNK_SIZE)
+                    size = int(response.headers.get('Content-Length') or 0)
+                    with ArchiveCacheWriter(stream, cache_path, digest) as source:
+                        if self.no_extract:
+                            save_archive(source, extract_path / filename)
+                        else:
+                            log(f"[INFO] Extracting {filename}")
+                            if not extract_archive(source, filename, extract_path, work_path,
+                                                   size, not self.scan_binaries):
+                                return None
+                        source.commit()
+                    if cache_path:
+                        self._prune_archive_cache(cache_path)
+
+            log(f"[INFO] Running TruffleHog scan on {package_identifier}")
+            return self._run_trufflehog(scan_path, package_identifier, only_verified,
+                                        no_verification, package_info, result_key)
+
+    def _run_trufflehog(self, scan_path, label, only_verified=False, no_verification=False,
+                        package_info=None, result_key=None):
+        """Run TruffleHog on scan_path, printing findings as they stream out
+
+        With a result_key, the findings of a complete run are stored for reuse.
+        Returns the number of findings; raises RuntimeError if TruffleHog
+        exits with an error, since its output may be incomplete.
+        """
+        # Build TruffleHog command
+        trufflehog_cmd = [
+            self.trufflehog_bin,
+            'filesystem',
+            str(scan_path),
+            '--no-update',
+            '--json'  # JSON output for parsing
+        ]
 
-            print(f"[INFO] Running TruffleHog scan on {package_identifier}")
-
-            # Build TruffleHog command
-            trufflehog_cmd = [
-                'trufflehog',
-                'filesystem',
-                str(extract_path),
-                '--no-update',
-                '--json'  # JSON output for parsing
-            ]
-
-            # Add verification flags
-            if only_verified:
-                trufflehog_cmd.append('--only-verified')
-            elif no_verification:
-                trufflehog_cmd.append('--no-verification')
-
-            # Run TruffleHog
-            result = subprocess.run(trufflehog_cmd, capture_output=True, text=True)
-
-            if result.stdout:
-                print("[RESULTS] TruffleHog Results:")
-                print(result.stdout)
-                
-                # Send Discord alert if verified secrets found
-                if package_info:
-                    self.discord_logger.send_alert(package_info, result.stdout)
+        # Add verification flags
+        if only_verified:
+            trufflehog_cmd.append('--only-verified')
+        elif no_verification:
+            trufflehog_cmd.append('--no-verification')
+
+        # Fewer detectors means fewer keywords to prefilter and patterns to run
+        if self.include_detectors:
+            trufflehog_cmd.append(f'--include-detectors={self.include_detectors}')
+        if self.exclude_detectors:
+            trufflehog_cmd.append(f'--exclude-detectors={self.exclude_detectors}')
+
+        finding_count = 0
+        verified_count = 0
+        # Only kept when they are going to be stored
+        findings = [] if result_key else None
+        stopped = False
+
+        def forward_stderr(stream):
+            for line in stream:
+                log(f"[WARN] TruffleHog stderr for {label}: "
+                    f"{line.decode('utf-8', 'replace').rstrip()}")
+
+        # Run TruffleHog, reading stdout and stderr on separate threads so
+        # neither pipe can fill up and stall the process
+        with self.trufflehog_slots:
+            with self.trufflehog_running_lock:
+                self.trufflehog_running += 1
+                concurrency = (self.trufflehog_concurrency
+                               or max(1, (os.cpu_count() or 1) // self.trufflehog_running))
+            trufflehog_cmd.append(f'--concurrency={concurrency}')
+            try:
+                with subprocess.Popen(trufflehog_cmd, stdout=subprocess.PIPE,
+                                      stderr=subprocess.PIPE) as proc:
+                    stderr_thread = threading.Thread(target=forward_stderr, args=(proc.stderr,),
+                                                     daemon=True)
+                    stderr_thread.start()
+                    try:
+                        for line in proc.stdout:
+                            # Findings are counted as they arrive rather than kept for later
+                            finding_count += 1
+                            verified = VERIFIED_RE.search(line) is not None
+                            verified_count += verified
+                            if findings is not None:
+                                findings.append(line)
+                            self._print_finding(line, label, scan_path)
+
+                            if verified and self.fail_fast:
+                                log(f"[INFO] Verified secret found in {label}, "
+                                    f"stopping (--fail-fast)")
+                                self.stop_event.set()
+                                proc.terminate()
+                                stopped = True
+                                break
+
+                        returncode = proc.wait()
+                    except BaseException:
+                        # Don't leave TruffleHog running when output fails or
+                        # the scan is interrupted
+                        proc.kill()
+                        raise
+                    finally:
+                        stderr_thread.join()
+            finally:
+                with self.trufflehog_running_lock:
+                    self.trufflehog_running -= 1
+
+        # A stopped or failed run may have missed findings, so it is not stored.
+        # It counts as alerted only once the alert has been delivered
+        stored = result_key and not stopped and returncode == 0
+        if stored:
+            self._store_scan_result(result_key, scan_path, findings)
+
+        if finding_count and package_info:
+            # Send Discord alert if verified secrets found
+            self.discord_logger.send_alert(
+                package_info, verified_count,
+                on_sent=(lambda: self._mark_alerted(result_key)) if stored else None)
+
+        # A run that exits with an error may have stopped partway, so the
+        # version failed even if some findings came out before it did
+        if not stopped and returncode != 0:
+            raise RuntimeError(f"TruffleHog exited with status {returncode}"
+                               f" after {finding_count} finding{'s' if finding_count != 1 else ''}")
+
+        if not finding_count:
+            log(f"[RESULTS] No secrets found in {label}")
+        return finding_count
+
+    def _print_finding(self, line, label, scan_path):
+        """Print one TruffleHog JSON finding line in the selected output format"""
+        with PRINT_LOCK:
+            if self.output_format == 'text':
+                message = format_finding(line.decode('utf-8', 'replace'), scan_path)
+                print(f"[RESULTS] {label}: {message}")
             else:
-                print("[RESULTS] No secrets found")
-
-            if result.stderr:
-                print("[WARN] TruffleHog stderr:")
-                print(result.stderr)
+                # JSON findings are passed through as raw bytes rather than
+                # decoded and re-encoded on the way to stdout. Flush pending
+                # print() output first to keep lines in order
+                sys.stdout.flush()
+                sys.stdout.buffer.write(f"[RESULTS] {label}: ".encode() + line.rstrip() + b'\n')
+
+    def _scan_result_key(self, digest, only_verified, no_verification):
+        """Key for reusing a TruffleHog result, or None if results can't be cached"""
+        if self.cache_dir is None or not digest or not self.trufflehog_version:
+            return None
+        algorithm, hexdigest = digest
+        mode = 'only-verified' if only_verified else 'no-verification' if no_verification else 'default'
+        detectors = ''
+        if self.include_detectors or self.exclude_detectors:
+            detectors = (f"|detectors={self.include_detectors or 'all'}"
+                         f"-{self.exclude_detectors or ''}")
+        return (f"{algorithm}-{hexdigest}|{mode}|binaries={self.scan_binaries}"
+                f"{'|no-extract' if self.no_extract else ''}{detectors}"
+                f"|{self.trufflehog_version}")
+
+    def _results_db(self):
+        """Open the scan result database, creating its table on first use"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.cache_dir / 'scan-results.sqlite3', timeout=30)
+        with self.results_db_lock:
+            if not self.results_db_ready:
+                with db:
+                    db.execute("CREATE TABLE IF NOT EXISTS scan_results ("
+                               "key TEXT PRIMARY KEY, scanned_at REAL, scan_path TEXT, "
+                               "findings BLOB, alerted INTEGER DEFAULT 0)")
+                    # Databases from before alerts were tracked; their rows
+                    # count as not alerted
+                    columns = [row[1] for row in db.execute("PRAGMA table_info(scan_results)")]
+                    if 'alerted' not in columns:
+                        db.execute("ALTER TABLE scan_results ADD COLUMN alerted INTEGER DEFAULT 0")
+                self.results_db_ready = True
+        return db
+
+    def _replay_scan_result(self, result_key, label, package_info=None):
+        """Print a stored TruffleHog result instead of scanning
+
+        Returns its number of findings, or None if there is no stored result.
+        """
+        try:
+            with closing(self._results_db()) as db:
+                row = db.execute("SELECT scanned_at, scan_path, findings, alerted "
+                                 "FROM scan_results WHERE key = ? AND scanned_at > ?",
+                                 (result_key, time.time() - SCAN_RESULT_TTL)).fetchone()
+        except sqlite3.Error as e:
+            log(f"[WARN] Could not read scan result cache: {e}")
+            return None
+        if row is None:
+            return None
 
-        except Exception as e:
-            print(f"[ERROR] Error scanning {package_identifier}: {e}")
-        finally:
-            # Cleanup
-            if work_dir and os.path.exists(work_dir):
-                print(f"[INFO] Cleaning up {work_dir}")
-                shutil.rmtree(work_dir)
+        scanned_at, scan_path, findings, alerted = row
+        log(f"[INFO] Reusing scan result for {label} from "
+            f"{datetime.fromtimestamp(scanned_at).isoformat(timespec='seconds')}")
+        # The stored run's work directory is long gone, so print file paths
+        # relative to it, as they sit inside the archive
+        if scan_path:
+            stale_prefix = json.dumps(os.path.join(scan_path, ''))[1:-1].encode()
+            findings = findings.replace(stale_prefix, b'')
+        lines = findings.splitlines(keepends=True)
+        for line in lines:
+            self._print_finding(line, f"{label} (cached)", None)
+        if not lines:
+            log(f"[RESULTS] No secrets found in {label}")
+        elif self.fail_fast and VERIFIED_RE.search(findings):
+            log(f"[INFO] Verified secret found in {label}, stopping (--fail-fast)")
+            self.stop_event.set()
+
+        # Alert now if the run that stored the result never got an alert through
+        verified_count = sum(VERIFIED_RE.search(line) is not None for line in lines)
+        if verified_count and not alerted and package_info and self.discord_logger.webhook_url:
+            self.discord_logger.send_alert(package_info, verified_count,
+                                           on_sent=lambda: self._mark_alerted(result_key))
+        return len(lines)
+
+    def _store_scan_result(self, result_key, scan_path, findings):
+        """Record a complete TruffleHog result for reuse, not yet alerted on"""
+        try:
+            with closing(self._results_db()) as db, db:
+                db.execute("INSERT OR REPLACE INTO scan_results "
+                           "(key, scanned_at, scan_path, findings, alerted) "
+                           "VALUES (?, ?, ?, ?, 0)",
+                           (result_key, time.time(), str(scan_path), b''.join(findings)))
+        except sqlite3.Error as e:
+            log(f"[WARN] Could not store scan result: {e}")
+
+    def _mark_alerted(self, result_key):
+        """Record that a stored result's Discord alert was delivered"""
+        try:
+            with closing(self._results_db()) as db, db:
+                db.execute("UPDATE scan_results SET alerted = 1 WHERE key = ?", (result_key,))
+        except sqlite3.Error as e:
+            log(f"[WARN] Could not update scan result: {e}")
+
+    def close(self):
+        """Send queued alerts, shut down the extraction workers and remove the work root"""
+        self.discord_logger.flush()
+        if self.extract_pool is not None:
+            self.extract_pool.shutdown()
+        shutil.rmtree(self.work_root, ignore_errors=True)
 
     def check_trufflehog(self):
-        """Check if TruffleHog is available"""
-        try:
-            result = subprocess.run(['trufflehog', '--version'],
-                                    capture_output=True, text=True)
-            print(f"[INFO] TruffleHog found: {result.stdout.strip()}")
-            return True
-        except FileNotFoundError:
+        """Check if TruffleHog is available, remembering where it was found"""
+        # Resolve PATH once here instead of on every TruffleHog run
+        trufflehog_bin = shutil.which('trufflehog')
+        if trufflehog_bin is None:
             print("[ERROR] TruffleHog not found. Please install it first.")
             return False
 
+        result = subprocess.run([trufflehog_bin, '--version'],
+                                capture_output=True, text=True)
+        self.trufflehog_bin = trufflehog_bin
+        self.trufflehog_version = result.stdout.strip() or None
+        print(f"[INFO] TruffleHog found: {result.stdout.strip()}")
+        return True
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -651,18 +1940,28 @@ Examples:
   python scan.py --pypi requests --version 2.28.1
   python scan.py --maven org.apache.commons:commons-lang3 --version 3.12.0
 
+  # Scan several packages at once
+  python scan.py --pypi requests flask django
+
   # Scan from file (works with all ecosystems)
   python scan.py --crates --file crate_names.txt
   python scan.py --pypi --file python_packages.txt
   python scan.py --npm --file npm_packages.txt
   python scan.py --maven --file maven_packages.txt
 
+  # Scan the dependencies of a project (exact pins are scanned at that version)
+  python scan.py --pypi --file requirements.txt
+  python scan.py --npm --file package.json
+
   # Scan with Discord alerts
   python scan.py --npm lodash --discord-webhook https://discord.com/api/webhooks/...
 
   # Scan with rate limiting
   python scan.py --pypi --file packages.txt --delay 2.0
 
+  # Scan all versions, four at a time
+  python scan.py --pypi requests --all-versions --jobs 4
+
 Package Ecosystems:
   --pypi      Scan Python packages from PyPI
   --npm       Scan JavaScript packages from npm (supports scoped packages)
@@ -670,8 +1969,9 @@ Package Ecosystems:
   --maven     Scan Java packages from Maven Central (format: group_id:artifact_id)
 
 Input Options:
-  package_name        Single package name to scan
-  --file FILE         Scan packages listed in text file (one per line) - works with all ecosystems
+  package_name        One or more package names to scan
+  --file FILE         Scan packages listed in text file (one per line), a requirements.txt or a
+                      package.json - works with all ecosystems
 
 Version Options:
   --version VERS      Scan a specific version
@@ -680,9 +1980,35 @@ Version Options:
 TruffleHog Options:
   --only-verified     Only report secrets that have been verified
   --no-verification   Skip verification entirely (faster but more false positives)
+  --fail-fast         Stop at the first verified secret and exit with status 1
+  --scan-binaries     Also scan compiled binaries, media, fonts and files over 10 MB
+  --no-extract        Pass archives to TruffleHog unextracted and let it decompress them
+  --include-detectors LIST
+                      Only run these TruffleHog detectors (comma-separated, e.g. AWS,GitHub)
+  --exclude-detectors LIST
+                      Skip these TruffleHog detectors (comma-separated)
+  --trufflehog-concurrency N
+                      Detector workers per TruffleHog run (default: CPUs shared between
+                      overlapping runs)
+
+Output Options:
+  --output FORMAT     Print findings as TruffleHog JSON lines (json, default) or readable text (text)
+  --quiet             Do not print the banner
 
 Batch Processing:
-  --delay SECONDS     Delay between packages when scanning from file (default: 1.0)
+  --delay SECONDS     Average time between requests to each registry API, after a burst of 5
+                      (default: 1.0)
+  --jobs N            Versions to download and scan in parallel (default: 8)
+  --workers N         Packages to scan in parallel when scanning several (default: 4)
+
+Caching and Work Files:
+  --no-cache          Do not read or write the metadata, archive and scan result cache in
+                      ~/.cache/revelio-scan
+  --offline           Scan only from the cache, without contacting any registry
+  --cache-max-size MB Size limit for cached archives; least recently used ones are deleted
+                      past it (default: 5120, 0 for no limit)
+  --tmp-dir DIR       Directory for downloads and extracted files (default: $REVELIO_TMPFS if
+                      set, else /dev/shm if it has 512 MB free, else /tmp)
 
 Discord Integration:
   --discord-webhook URL   Discord webhook URL for alerts when verified secrets found
@@ -691,15 +2017,21 @@ Discord Integration:
 
     # Package ecosystem
     ecosystem_group = parser.add_mutually_exclusive_group(required=True)
-    ecosystem_group.add_argument('--pypi', action='store_true', help='Scan PyPI package')
-    ecosystem_group.add_argument('--npm', action='store_true', help='Scan npm package')
-    ecosystem_group.add_argument('--crates', action='store_true', help='Scan Rust crates')
-    ecosystem_group.add_argument('--maven', action='store_true', help='Scan Maven package (format: group_id:artifact_id)')
-
-    # Input options
-    input_group = parser.add_mutually_exclusive_group(required=True)
-    input_group.add_argument('package_name', nargs='?', help='Package name to scan')
-    input_group.add_argument('--file', help='Text file containing package names (one per line)')
+    ecosystem_group.add_argument('--pypi', dest='ecosystem', action='store_const', const='pypi',
+                                 help='Scan PyPI package')
+    ecosystem_group.add_argument('--npm', dest='ecosystem', action='store_const', const='npm',
+                                 help='Scan npm package')
+    ecosystem_group.add_argument('--crates', dest='ecosystem', action='store_const', const='crates',
+                                 help='Scan Rust crates')
+    ecosystem_group.add_argument('--maven', dest='ecosystem', action='store_const', const='maven',
+                                 help='Scan Maven package (format: group_id:artifact_id)')
+
+    # Input options (checked below: argparse cannot make a '*' positional
+    # mutually exclusive with an option)
+    parser.add_argument('package_name', nargs='*', help='Package name(s) to scan')
+    parser.add_argument('--file',
+                       help='Text file containing package names (one per line), a '
+                            'requirements.txt or a package.json')
 
     # Version options
     version_group = parser.add_mutually_exclusive_group()
@@ -714,9 +2046,51 @@ Discord Integration:
     verification_group.add_argument('--no-verification', action='store_true',
                                     help='Skip verification (faster, more false positives)')
 
+    parser.add_argument('--fail-fast', action='store_true',
+                       help='Stop at the first verified secret and exit with status 1')
+    parser.add_argument('--scan-binaries', action='store_true',
+                       help='Also extract and scan compiled binaries, media, fonts and files '
+                            'over 10 MB (skipped by default)')
+    parser.add_argument('--include-detectors', metavar='LIST',
+                       help='Only run these TruffleHog detectors (comma-separated detector '
+                            'types, e.g. AWS,GitHub)')
+    parser.add_argument('--exclude-detectors', metavar='LIST',
+                       help='Skip these TruffleHog detectors (comma-separated detector types)')
+    parser.add_argument('--trufflehog-concurrency', type=int, metavar='N',
+                       help='Detector workers for each TruffleHog run (default: the CPU count '
+                            'divided between runs in progress)')
+    parser.add_argument('--no-extract', action='store_true',
+                       help='Pass downloaded archives to TruffleHog without extracting them; '
+                            'TruffleHog decompresses them itself and --scan-binaries has no '
+                            'effect')
+
+    # Output options
+    parser.add_argument('--output', choices=['json', 'text'], default='json',
+                       help='Print findings as TruffleHog JSON lines or as readable text (default: json)')
+    parser.add_argument('--quiet', action='store_true', help='Do not print the banner')
+
     # Batch processing options
     parser.add_argument('--delay', type=float, default=1.0,
-                       help='Delay between packages when scanning from file (seconds)')
+                       help='Average time between requests to each registry API, after a burst '
+                            'of 5 (seconds)')
+    parser.add_argument('--jobs', type=int, default=8,
+                       help='Number of versions to download and scan in parallel (default: 8)')
+    parser.add_argument('--workers', type=int, default=4,
+                       help='Number of packages to scan in parallel when scanning several '
+                            '(default: 4)')
+
+    # Caching and work files
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the metadata, archive and scan result cache')
+    parser.add_argument('--offline', action='store_true',
+                       help='Use only cached metadata, archives and scan results; make no '
+                            'registry requests')
+    parser.add_argument('--cache-max-size', type=int, default=ARCHIVE_CACHE_MAX_MB, metavar='MB',
+                       help='Size limit for cached archives; the least recently used ones are '
+                            'deleted past it (default: 5120, 0 for no limit)')
+    parser.add_argument('--tmp-dir',
+                       help='Directory for downloads and extracted files (default: '
+                            '$REVELIO_TMPFS if set, else /dev/shm if it has 512 MB free, else /tmp)')
 
     # Discord integration
     parser.add_argument('--discord-webhook', help='Discord webhook URL for alerts')
@@ -726,26 +2100,62 @@ Discord Integration:
     # Validate arguments
     if not args.package_name and not args.file:
         parser.error('Either package_name or --file is required')
+    if args.package_name and args.file:
+        parser.error('package_name and --file cannot be used together')
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.trufflehog_concurrency is not None and args.trufflehog_concurrency < 1:
+        parser.error('--trufflehog-concurrency must be at least 1')
+    if args.delay < 0:
+        parser.error('--delay cannot be negative')
+    if args.cache_max_size < 0:
+        parser.error('--cache-max-size cannot be negative')
+    if args.offline and args.no_cache:
+        parser.error('--offline needs the cache, so it cannot be used with --no-cache')
+    if args.offline and args.discord_webhook:
+        parser.error('--offline cannot send Discord alerts; drop --discord-webhook')
+    if args.tmp_dir and not os.path.isdir(args.tmp_dir):
+        parser.error(f'--tmp-dir {args.tmp_dir} is not a directory')
 
     # Show ASCII art banner
-    print(ASCII_ART)
-
-    scanner = PackageScanner(args.discord_webhook)
+    if not args.quiet:
+        print(ASCII_ART)
+
+    scanner = PackageScanner(discord_webhook=args.discord_webhook,
+                             jobs=args.jobs,
+                             use_cache=not args.no_cache,
+                             output_format=args.output,
+                             temp_dir=args.tmp_dir,
+                             workers=args.workers,
+                             request_interval=args.delay,
+                             scan_binaries=args.scan_binaries,
+                             fail_fast=args.fail_fast,
+                             no_extract=args.no_extract,
+                             offline=args.offline,
+                             trufflehog_concurrency=args.trufflehog_concurrency,
+                             include_detectors=args.include_detectors,
+                             exclude_detectors=args.exclude_detectors,
+                             archive_cache_max_mb=args.cache_max_size)
 
     # Check if TruffleHog is available
     if not scanner.check_trufflehog():
         sys.exit(1)
 
-    # Determine ecosystem
-    ecosystem = 'pypi' if args.pypi else 'npm' if args.npm else 'crates' if args.crates else 'maven'
+    ecosystem = args.ecosystem
 
     # Show configuration
     if args.file:
         print(f"[INFO] Batch scanning from file: {args.file}")
         print(f"[INFO] Ecosystem: {ecosystem}")
-        print(f"[INFO] Delay between packages: {args.delay}s")
+        print(f"[INFO] Delay between registry requests: {args.delay}s")
+    elif len(args.package_name) > 1:
+        print(f"[INFO] Starting scan for {len(args.package_name)} packages: "
+              f"{', '.join(args.package_name)}")
+        print(f"[INFO] Ecosystem: {ecosystem}")
     else:
-        print(f"[INFO] Starting scan for package: {args.package_name}")
+        print(f"[INFO] Starting scan for package: {args.package_name[0]}")
         print(f"[INFO] Ecosystem: {ecosystem}")
 
     # Show verification mode
@@ -762,25 +2172,34 @@ Discord Integration:
     try:
         if args.file:
             scanner.scan_from_file(args.file, ecosystem, args.version, args.all_versions,
-                                 args.only_verified, args.no_verification, args.delay)
+                                 args.only_verified, args.no_verification)
+        elif len(args.package_name) > 1:
+            packages = [(name, None) for name in dict.fromkeys(args.package_name)]
+            scanner.scan_packages(packages, ecosystem, args.version, args.all_versions,
+                                  args.only_verified, args.no_verification)
         else:
-            if args.pypi:
-                scanner.scan_pypi_package(args.package_name, args.version, args.all_versions,
-                                        args.only_verified, args.no_verification)
-            elif args.npm:
-                scanner.scan_npm_package(args.package_name, args.version, args.all_versions,
-                                       args.only_verified, args.no_verification)
-            elif args.crates:
-                scanner.scan_crates_package(args.package_name, args.version, args.all_versions,
-                                          args.only_verified, args.no_verification)
-            elif args.maven:
-                scanner.scan_maven_package(args.package_name, args.version, args.all_versions,
-                                         args.only_verified, args.no_verification)
+            scanner.scan_package(ecosystem, args.package_name[0], args.version, args.all_versions,
+                                 args.only_verified, args.no_verification)
     except KeyboardInterrupt:
         print("\n[WARN] Scan interrupted by user")
         sys.exit(1)
-    except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
+    except ScannerFatalError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    finally:
+        scanner.close()
+
+    # A lone version's outcome is already the last thing printed
+    if len(scanner.scan_results) + len(scanner.failed) > 1:
+        scanner.print_summary()
+
+    if scanner.stop_event.is_set():
+        print("[INFO] Scan stopped at the first verified secret")
+        sys.exit(1)
+
+    if scanner.failed:
+        print(f"[ERROR] Scan completed, but {len(scanner.failed)} package(s) or version(s) "
+              f"could not be scanned")
         sys.exit(1)
 
     print("[INFO] Scan completed")